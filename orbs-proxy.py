@@ -1,71 +1,255 @@
+import asyncio
 import logging
-from datetime import datetime
-from typing import Literal
+import os
+from contextlib import asynccontextmanager
+from typing import Annotated, Literal, Optional
 
 import httpx
-from fastapi import FastAPI, HTTPException, Request
+import ijson
+import msgspec
+import orjson
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
 from slowapi import Limiter
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
+from uvicorn.logging import DefaultFormatter
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one HTTP client (and its connection pool) across all requests."""
+    app.state.http_client = httpx.AsyncClient(
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30.0),
+        http2=True,  # multiplex concurrent upstream requests over one connection
+        headers={"Accept-Encoding": "br, gzip"},  # br is decoded via the brotli package
+    )
+    yield
+    await app.state.http_client.aclose()
+
+
+class JSONBytesResponse(Response):
+    """JSON response rendered with orjson; already serialized bytes pass through as-is."""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=JSONBytesResponse)
 
 logger = logging.getLogger("uvicorn")
+# Let the formatter add timestamps instead of building them in every message
+for handler in logger.handlers:
+    handler.setFormatter(DefaultFormatter("%(asctime)s %(levelprefix)s %(message)s"))
 
 # ✅ Initialize Rate Limiter (5 requests per minute per IP)
-limiter = Limiter(key_func=get_remote_address, default_limits=["5/minute"])
+# Counters live in Redis so they are shared by all workers/replicas; if Redis
+# can't be reached, the limiter falls back to per-process memory.
+RATELIMIT_STORAGE_URI = os.environ.get("RATELIMIT_STORAGE_URI", "redis://localhost:6379/0")
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["5/minute"],
+    storage_uri=RATELIMIT_STORAGE_URI,
+    strategy="moving-window",
+    in_memory_fallback_enabled=True,
+)
 app.state.limiter = limiter
 app.add_middleware(SlowAPIMiddleware)
 
 #base URLs for APIs
 WEATHER_API_BASE = "https://swd.weatherflow.com/swd/rest/better_forecast"
-PARQET_API_BASE = "https://api.parqet.com/v1/portfolios/assemble?useInclude=true&include=ttwror&include=performance_charts&resolution=200"
+PARQET_API_BASE = "https://api.parqet.com/v1/portfolios/assemble"
+
+# Short-lived cache of serialized responses, shared by all clients
+TEMPEST_CACHE = TTLCache(maxsize=1024, ttl=30)
+PARQUET_CACHE = TTLCache(maxsize=1024, ttl=60)
+_cache_locks: dict[tuple, asyncio.Lock] = {}  # one lock per in-flight cache miss
+
+# Fields passed through from the Weather API response
+TEMPEST_CURRENT_KEYS = (
+    "air_temperature",
+    "icon",
+    "conditions",
+    "feels_like",
+    "relative_humidity",
+    "station_pressure",
+    "precip_probability",
+    "wind_gust",
+)
+TEMPEST_DAILY_KEYS = (
+    "day_start_local",
+    "air_temp_high",
+    "air_temp_low",
+    "conditions",
+    "day_num",
+    "month_num",
+    "precip_probability",
+    "precip_type",
+    "icon",
+    "precip_icon",
+)
+
+# Shared read-only default for missing sub-objects (never mutate)
+_EMPTY = {}
+
+# Fields read from each Parqet holding / the portfolio performance
+PARQET_HOLDING_FIELDS = (
+    "assetType",
+    "currency",
+    "asset.identifier",
+    "sharedAsset.name",
+    "performance.priceAtIntervalStart",
+    "performance.purchaseValueForInterval",
+    "position.isSold",
+    "position.shares",
+    "position.currentPrice",
+    "position.currentValue",
+)
+PARQET_PERFORMANCE_FIELDS = ("purchaseValueForInterval", "value")
+PARQET_ASSET_TYPES = frozenset(("security", "crypto"))
+
+
+# Allowed values, shared by the pydantic models and the msgspec body structs
+UnitsTemp = Literal["c", "f"]
+UnitsWind = Literal["mph", "kph", "m/s"]
+UnitsPressure = Literal["mb", "inHg"]
+UnitsPrecip = Literal["in", "mm"]
+UnitsDistance = Literal["mi", "km"]
+Timeframe = Literal["today", "1d", "1w", "1m", "3m", "6m", "1y", "5y", "10y", "mtd", "ytd", "max"]
+Perf = Literal["returnGross", "returnNet", "totalReturnGross", "totalReturnNet", "ttwror", "izf"]
+PerfChart = Literal["perfHistory", "perfHistoryUnrealized", "ttwror", "drawdown"]
 
 
 # Model for the new query parameters
 class WeatherRequest(BaseModel):
     station_id: str
-    units_temp: Literal["c", "f"]
-    units_wind: Literal["mph", "kph", "m/s"]
-    units_pressure: Literal["mb", "inHg"]
-    units_precip: Literal["in", "mm"]
-    units_distance: Literal["mi", "km"]
+    units_temp: UnitsTemp
+    units_wind: UnitsWind
+    units_pressure: UnitsPressure
+    units_precip: UnitsPrecip
+    units_distance: UnitsDistance
     api_key: str
 
 class PortfolioRequest(BaseModel):
     id: str
-    timeframe: Literal["today", "1d", "1w", "1m", "3m", "6m", "1y", "5y", "10y", "mtd", "ytd", "max"]
-    perf: Literal["returnGross", "returnNet", "totalReturnGross", "totalReturnNet", "ttwror", "izf"]
-    perfChart: Literal["perfHistory", "perfHistoryUnrealized", "ttwror", "drawdown"]
+    timeframe: Timeframe
+    perf: Perf
+    perfChart: Optional[PerfChart] = None  # omit to skip the chart
 
 
+# Same fields as above, used to decode POST bodies straight from bytes
+class WeatherBody(msgspec.Struct):
+    station_id: str
+    units_temp: UnitsTemp
+    units_wind: UnitsWind
+    units_pressure: UnitsPressure
+    units_precip: UnitsPrecip
+    units_distance: UnitsDistance
+    api_key: str
+
+class PortfolioBody(msgspec.Struct):
+    id: str
+    timeframe: Timeframe
+    perf: Perf
+    perfChart: Optional[PerfChart] = None
 
-async def fetch_weather_data(url: str, params: dict):
+
+
+async def fetch_weather_data(client: httpx.AsyncClient, url: str, params: dict):
     """Helper function to send a request to the Weather API."""
-    logger.info(f"Sending request to {url} with params {params}")
-    async with httpx.AsyncClient(timeout=10) as client:
-        try:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=f"Weather API error: {e.response.text}")
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=502, detail=f"Proxy error: {str(e)}")
-
-async def fetch_parqet_data(url: str, payload: dict):
-    """Helper function to send a request to Parqet."""
-    logger.info(f"Sending request to {url} with payload {payload}")
-    async with httpx.AsyncClient(timeout=10) as client:
-        try:
-            response = await client.post(url, json=payload)
+    logger.info("Sending request to %s with params %s", url, params)
+    try:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"Weather API error: {e.response.text}")
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=502, detail=f"Proxy error: {str(e)}")
+
+async def fetch_parqet_data(client: httpx.AsyncClient, url: str, payload: dict, perf: str, perf_chart: Optional[str]):
+    """Helper function to send a request to Parqet and stream-parse the response."""
+    logger.info("Sending request to %s with payload %s", url, payload)
+    try:
+        async with client.stream("POST", url, json=payload) as response:
+            if response.is_error:
+                await response.aread()  # load the body for the error detail
             response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=f"Parqet API error: {e.response.text}")
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=502, detail=f"Proxy error: {str(e)}")
+            return await parse_parqet_stream(response, perf, perf_chart)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"Parqet API error: {e.response.text}")
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=502, detail=f"Proxy error: {str(e)}")
+
+
+def _set_path(target: dict, path: str, value):
+    """Store `value` in `target` under a dotted `path`, creating sub-dicts as needed."""
+    *parents, leaf = path.split(".")
+    for key in parents:
+        target = target.setdefault(key, {})
+    target[leaf] = value
+
+
+async def parse_parqet_stream(response: httpx.Response, perf: str, perf_chart: Optional[str]) -> dict:
+    """
+    Incrementally parses a Parqet response, keeping only the leaves used by
+    `transform_data_parquet`. The result has the same shape as the upstream
+    JSON, so the rest of the document is never materialized.
+    """
+    holding_fields = {*PARQET_HOLDING_FIELDS, f"performance.{perf}"}
+    performance_fields = {*PARQET_PERFORMANCE_FIELDS, perf}
+    chart_value = f"charts.item.values.{perf_chart}" if perf_chart else None
+
+    holdings, charts, performance = [], [], {}
+    data = {}
+
+    def handle(prefix, event, value):
+        # Containers: only track where holdings, charts and performance start
+        if event == "start_map":
+            if prefix == "holdings.item":
+                holdings.append({})
+            elif prefix == "charts.item" and chart_value:
+                charts.append({})
+            elif prefix == "performance":
+                data["performance"] = performance
+            return
+        if event == "start_array":
+            if prefix == "holdings":
+                data["holdings"] = holdings
+            elif prefix == "charts" and chart_value:
+                data["charts"] = charts
+            return
+        if event in ("end_map", "end_array", "map_key"):
+            return
+        # Scalars: keep only the leaves we need
+        if prefix.startswith("holdings.item."):
+            field = prefix[len("holdings.item."):]
+            if field in holding_fields:
+                _set_path(holdings[-1], field, value)
+        elif prefix == chart_value:
+            charts[-1]["values"] = {perf_chart: value}
+        elif prefix.startswith("performance."):
+            field = prefix[len("performance."):]
+            if field in performance_fields:
+                performance[field] = value
+
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    async for chunk in response.aiter_bytes():
+        parser.send(chunk)
+        for event in events:
+            handle(*event)
+        del events[:]
+    parser.close()
+    for event in events:
+        handle(*event)
+
+    return data
 
 
 def transform_data_tempest(data: dict) -> dict:
@@ -73,198 +257,190 @@ def transform_data_tempest(data: dict) -> dict:
     Filters and restructures JSON to include only specified fields.
     Includes the first 4 daily forecast items and adds `day_start_local`.
     """
-    filtered_data = {
-        "current_conditions": {},
-        "forecast": {
-            "daily": []  # Initialize an empty list for daily forecasts
-        }
-    }
-
     # Filter current conditions
-    if "current_conditions" in data:
-        current_conditions = data["current_conditions"]
-        filtered_data["current_conditions"]["air_temperature"] = current_conditions.get("air_temperature")
-        filtered_data["current_conditions"]["icon"] = current_conditions.get("icon")
-        filtered_data["current_conditions"]["conditions"] = current_conditions.get("conditions")
-        filtered_data["current_conditions"]["feels_like"] = current_conditions.get("feels_like")
-        filtered_data["current_conditions"]["relative_humidity"] = current_conditions.get("relative_humidity")
-        filtered_data["current_conditions"]["station_pressure"] = current_conditions.get("station_pressure")
-        filtered_data["current_conditions"]["precip_probability"] = current_conditions.get("precip_probability")
-        filtered_data["current_conditions"]["wind_gust"] = current_conditions.get("wind_gust")
+    current_conditions = data.get("current_conditions")
+    if current_conditions is not None:
+        filtered_current = {key: current_conditions.get(key) for key in TEMPEST_CURRENT_KEYS}
+    else:
+        filtered_current = {}
 
     # Filter forecast data (first 4 days)
-    if "forecast" in data and "daily" in data["forecast"]:
-        for daily_forecast in data["forecast"]["daily"][:4]:  # Only take the first 4 items
-            filtered_daily = {
-                "day_start_local": daily_forecast.get("day_start_local"),
-                "air_temp_high": daily_forecast.get("air_temp_high"),
-                "air_temp_low": daily_forecast.get("air_temp_low"),
-                "conditions": daily_forecast.get("conditions"),
-                "day_num": daily_forecast.get("day_num"),
-                "month_num": daily_forecast.get("month_num"),
-                "precip_probability": daily_forecast.get("precip_probability"),
-                "precip_type": daily_forecast.get("precip_type"),
-                "icon": daily_forecast.get("icon"),
-                "precip_icon": daily_forecast.get("precip_icon")
-
-            }
-            filtered_data["forecast"]["daily"].append(filtered_daily)
-
-    return filtered_data
+    daily = data.get("forecast", {}).get("daily", ())
+    filtered_daily = [
+        {key: daily_forecast.get(key) for key in TEMPEST_DAILY_KEYS}
+        for daily_forecast in daily[:4]  # Only take the first 4 items
+    ]
+
+    return {
+        "current_conditions": filtered_current,
+        "forecast": {"daily": filtered_daily},
+    }
 
 
 def transform_data_parquet(data: dict, perf, perf_chart):
     """Filters and restructures JSON to keep only specified fields."""
-    filtered_data = {"holdings": [], "performance": {}, "chart": []}
-
-    if "holdings" in data:
-        for holding in data["holdings"]:
-            asset_type = holding.get("assetType", "").lower()
-            if asset_type not in ["security", "crypto"]:
-                continue
-            is_sold = holding.get("position", {}).get("isSold")
-            shares = holding.get("position", {}).get("shares")
-            if is_sold or shares == 0:
-                continue
-            filtered_holding = {
-                "assetType": asset_type,
-                "currency": holding.get("currency"),
-                "id": holding.get("asset", {}).get("identifier"),
-                "name": holding.get("sharedAsset", {}).get("name"),
-                "priceStart": holding.get("performance", {}).get("priceAtIntervalStart"),
-                "valueStart": holding.get("performance", {}).get("purchaseValueForInterval"),
-                "priceNow": holding.get("position", {}).get("currentPrice"),
-                "valueNow": holding.get("position", {}).get("currentValue"),
-                "shares": holding.get("position", {}).get("shares"),
-                "perf": get_perf(holding.get("performance", {}), perf)
-            }
-            filtered_data["holdings"].append(filtered_holding)
-
-    performance_data = data.get("performance", {})
-    filtered_data["performance"] = {
-        "valueStart": performance_data.get("purchaseValueForInterval"),
-        "valueNow": performance_data.get("value"),
+    holdings_out = []
+    append = holdings_out.append
+
+    for holding in data.get("holdings") or ():
+        asset_type = holding.get("assetType", "").lower()
+        if asset_type not in PARQET_ASSET_TYPES:
+            continue
+        position = holding.get("position") or _EMPTY
+        shares = position.get("shares")
+        if position.get("isSold") or shares == 0:
+            continue
+        performance = holding.get("performance") or _EMPTY
+        append({
+            "assetType": asset_type,
+            "currency": holding.get("currency"),
+            "id": (holding.get("asset") or _EMPTY).get("identifier"),
+            "name": (holding.get("sharedAsset") or _EMPTY).get("name"),
+            "priceStart": performance.get("priceAtIntervalStart"),
+            "valueStart": performance.get("purchaseValueForInterval"),
+            "priceNow": position.get("currentPrice"),
+            "valueNow": position.get("currentValue"),
+            "shares": shares,
+            "perf": performance.get(perf, 0)
+        })
+
+    performance_data = data.get("performance") or _EMPTY
+    # logger.info("Got portfolio perf for %s: %s", perf, performance_data.get(perf, 0))
+
+    charts = data.get("charts") or ()
+    chart_out = [
+        (chart.get("values") or _EMPTY).get(perf_chart, 0)
+        for chart in charts[1:]  # skip first
+    ]
+
+    return {
+        "holdings": holdings_out,
+        "performance": {
+            "valueStart": performance_data.get("purchaseValueForInterval"),
+            "valueNow": performance_data.get("value"),
+            "perf": performance_data.get(perf, 0),
+        },
+        "chart": chart_out,
     }
-    # logger.info(f"Got portfolio perf for {perf}: {get_perf(performance_data, perf)}")
-    filtered_data["performance"]["perf"] = get_perf(performance_data, perf)
 
-    if "charts" in data:
-        first = True
-        for chart in data["charts"]:
-            if first:
-                # skip first
-                first = False
-                continue
-            filtered_data["chart"].append(get_perf_chart(chart, perf_chart))
 
-    return filtered_data
+async def load_tempest(client: httpx.AsyncClient, params: dict):
+    """Fetch and filter the forecast for already validated query parameters, as JSON bytes."""
+    # Fetch the data
+    raw_data = await fetch_weather_data(client, WEATHER_API_BASE, params)
 
+    # Transform the data and serialize it once, so cache hits skip both
+    return msgspec.json.encode(transform_data_tempest(raw_data))
 
-def get_perf(data, perf):
-    return data.get(perf, 0)
 
+async def load_parquet(client: httpx.AsyncClient, request_data: PortfolioRequest):
+    """Fetch and filter the portfolio for an already validated request, as JSON bytes."""
+    # Construct API URL and payload, only asking for the chart series if it's used
+    query = ["useInclude=true", "include=ttwror"]
+    if request_data.perfChart:
+        query += ["include=performance_charts", "resolution=200"]
+    url = f"{PARQET_API_BASE}?{'&'.join(query)}"
+    payload = {
+        "portfolioIds": [request_data.id],
+        "holdingIds": [],
+        "assetTypes": [],
+        "timeframe": request_data.timeframe
+    }
 
-def get_perf_chart(data, perf_chart):
-    values = data.get("values", {})
-    return values.get(perf_chart, 0)
+    # Fetch the data
+    raw_data = await fetch_parqet_data(client, url, payload, request_data.perf, request_data.perfChart)
 
+    # logger.info("Received raw data: %s", len(raw_data))
+    return msgspec.json.encode(transform_data_parquet(raw_data, request_data.perf, request_data.perfChart))
 
-@app.post("/tempest")
-@app.get("/tempest")
-@limiter.limit("5/minute")  # ⏳ Apply rate limit (5 requests per minute per IP)
-async def proxy_request_tempest(request: Request):
-    """Secure JSON proxy with rate limiting."""
-    logger.info(
-        f"{datetime.now().isoformat()} Received {request.method} request: {request.url} from {get_remote_address(request)}"
+
+async def get_cached(cache: TTLCache, key: tuple, load):
+    """
+    Returns `cache[key]`, calling `load()` to fill it on a miss.
+    Concurrent misses for the same key wait for a single upstream call.
+    """
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    lock = _cache_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            result = cache.get(key)
+            if result is None:
+                result = await load()
+                cache[key] = result
+    finally:
+        if _cache_locks.get(key) is lock and not lock.locked():
+            del _cache_locks[key]
+    return result
+
+
+async def proxy_tempest(request: Request, request_data: WeatherRequest):
+    """Returns the filtered forecast, served from cache when possible."""
+    logger.info("Received %s request: %s from %s", request.method, request.url, get_remote_address(request))
+    # The request fields map 1:1 onto the Weather API query parameters
+    params = request_data.model_dump()
+    key = ("tempest", *params.values())
+    content = await get_cached(
+        TEMPEST_CACHE, key, lambda: load_tempest(request.app.state.http_client, params)
     )
+    return JSONBytesResponse(content)
 
-    if request.method == "GET":
-        # Extract and validate query parameters
-        station_id = request.query_params.get("station_id")
-        units_temp = request.query_params.get("units_temp")
-        units_wind = request.query_params.get("units_wind")
-        units_pressure = request.query_params.get("units_pressure")
-        units_precip = request.query_params.get("units_precip")
-        units_distance = request.query_params.get("units_distance")
-        api_key = request.query_params.get("api_key")
-
-        if not all([station_id, units_temp, units_wind, units_pressure, units_precip, units_distance, api_key]):
-            raise HTTPException(status_code=400, detail="Missing required query parameters")
-
-        request_data = WeatherRequest(
-            station_id=station_id,
-            units_temp=units_temp,
-            units_wind=units_wind,
-            units_pressure=units_pressure,
-            units_precip=units_precip,
-            units_distance=units_distance,
-            api_key=api_key,
-        )
-    elif request.method == "POST":  # POST
-        try:
-            body = await request.json()
-            request_data = WeatherRequest(**body)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail="Invalid JSON body.") from e
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported request method")
-
-    # Construct API URL and query parameters
-    params = {
-        "station_id": request_data.station_id,
-        "units_temp": request_data.units_temp,
-        "units_wind": request_data.units_wind,
-        "units_pressure": request_data.units_pressure,
-        "units_precip": request_data.units_precip,
-        "units_distance": request_data.units_distance,
-        "api_key": request_data.api_key,
-    }
 
-    # Fetch the data
-    raw_data = await fetch_weather_data(WEATHER_API_BASE, params)
+async def proxy_parquet(request: Request, request_data: PortfolioRequest):
+    """Returns the filtered portfolio, served from cache when possible."""
+    logger.info("Received %s request: %s from %s", request.method, request.url, get_remote_address(request))
+    key = ("parquet", *request_data.model_dump().values())
+    content = await get_cached(
+        PARQUET_CACHE, key, lambda: load_parquet(request.app.state.http_client, request_data)
+    )
+    return JSONBytesResponse(content)
 
-    # Transform the data
-    return transform_data_tempest(raw_data)
 
-@app.post("/parquet")
-@app.get("/parquet")
-@limiter.limit("5/minute")  # ⏳ Apply rate limit (5 requests per minute per IP)
-async def proxy_request_parquet(request: Request):
-    """Secure JSON proxy with rate limiting."""
-    logger.info(
-        f"{datetime.now().isoformat()} Received {request.method} request: {request.url} from {get_remote_address(request)}")
-    if request.method == "GET":
-        id = request.query_params.get("id")
-        timeframe = request.query_params.get("timeframe")
-        perf = request.query_params.get("perf")
-        perf_chart = request.query_params.get("perfChart")
-
-        if not id or not timeframe or not perf or not perf_chart:
-            raise HTTPException(status_code=400,
-                                detail="Missing required query parameters")
-
-        request_data = PortfolioRequest(id=id, timeframe=timeframe, perf=perf, perfChart=perf_chart)
-    elif request.method == "POST":  # POST
-        try:
-            body = await request.json()
-            request_data = PortfolioRequest(**body)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail="Invalid JSON body.") from e
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported")
+async def decode_body(request: Request, body_type: type[msgspec.Struct], model_type: type[BaseModel]):
+    """Decodes and validates a JSON body with msgspec and returns it as `model_type`."""
+    try:
+        body = msgspec.json.decode(await request.body(), type=body_type)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    # Already validated by msgspec, so skip pydantic validation
+    return model_type.model_construct(**msgspec.structs.asdict(body))
 
-    # Construct API URL and payload
-    url = PARQET_API_BASE
-    payload = {
-        "portfolioIds": [request_data.id],
-        "holdingIds": [],
-        "assetTypes": [],
-        "timeframe": request_data.timeframe
+
+def json_body(model_type: type[BaseModel]) -> dict:
+    """OpenAPI docs for a JSON body that is decoded by hand."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model_type.model_json_schema()}},
+        }
     }
 
-    # Fetch the data
-    raw_data = await fetch_parqet_data(url, payload)
 
-    # logger.info(f"{datetime.now().isoformat()} Received raw data: {len(raw_data)}")
-    return transform_data_parquet(raw_data, request_data.perf, request_data.perfChart)
+# GET and POST share one rate limit per endpoint (5 requests per minute per IP)
+@app.get("/tempest")
+@limiter.shared_limit("5/minute", scope="tempest")  # ⏳ Apply rate limit
+async def proxy_request_tempest_get(request: Request, request_data: Annotated[WeatherRequest, Depends()]):
+    """Secure JSON proxy with rate limiting (query parameters)."""
+    return await proxy_tempest(request, request_data)
+
+@app.post("/tempest", openapi_extra=json_body(WeatherRequest))
+@limiter.shared_limit("5/minute", scope="tempest")  # ⏳ Apply rate limit
+async def proxy_request_tempest_post(request: Request):
+    """Secure JSON proxy with rate limiting (JSON body)."""
+    request_data = await decode_body(request, WeatherBody, WeatherRequest)
+    return await proxy_tempest(request, request_data)
 
+@app.get("/parquet")
+@limiter.shared_limit("5/minute", scope="parquet")  # ⏳ Apply rate limit
+async def proxy_request_parquet_get(request: Request, request_data: Annotated[PortfolioRequest, Depends()]):
+    """Secure JSON proxy with rate limiting (query parameters)."""
+    return await proxy_parquet(request, request_data)
+
+@app.post("/parquet", openapi_extra=json_body(PortfolioRequest))
+@limiter.shared_limit("5/minute", scope="parquet")  # ⏳ Apply rate limit
+async def proxy_request_parquet_post(request: Request):
+    """Secure JSON proxy with rate limiting (JSON body)."""
+    request_data = await decode_body(request, PortfolioBody, PortfolioRequest)
+    return await proxy_parquet(request, request_data)